@@ -2,16 +2,24 @@ import streamlit as st
 import logging
 import logging.config
 import yaml
+import hashlib
 from pathlib import Path
 from core.config import settings
 
 # Setup Logging
 def setup_logging():
-    log_path = Path("meaning_engine/logging.yaml")
+    # Resolve next to this file so it works regardless of the working directory
+    log_path = Path(__file__).resolve().parent / "logging.yaml"
+    if not log_path.exists():
+        log_path = settings.LOG_CONFIG_PATH
     if log_path.exists():
         with open(log_path, 'r') as f:
             config = yaml.safe_load(f.read())
-            logging.config.dictConfig(config)
+        # Relative log file paths depend on the cwd; pin them to LOGS_DIR
+        for handler in config.get("handlers", {}).values():
+            if "filename" in handler:
+                handler["filename"] = str(settings.LOGS_DIR / Path(handler["filename"]).name)
+        logging.config.dictConfig(config)
     else:
         # Fallback if running from root
         logging.basicConfig(level=logging.INFO)
@@ -19,6 +27,9 @@ def setup_logging():
 setup_logging()
 logger = logging.getLogger("meaning_engine")
 
+from core.observability.instrumentation import registry, start_metrics_server
+start_metrics_server()
+
 st.set_page_config(page_title="Meaning Engine", page_icon="🧠", layout="wide")
 
 st.title("🧠 Meaning Engine")
@@ -27,6 +38,10 @@ st.markdown("**Universal Semantic Layer** | _Preserving Knowledge, Not Compressi
 st.sidebar.header("System Status")
 st.sidebar.success(f"System: {settings.SYSTEM_NAME}")
 st.sidebar.info(f"Version: {settings.VERSION}")
+# Filled at the end of the script with the spans recorded since this point (this rerun).
+# The registry is process-wide, so concurrent sessions also show up in the delta.
+stage_timings = st.sidebar.empty()
+timings_before = registry.snapshot()
 
 st.divider()
 
@@ -59,11 +74,13 @@ if uploaded_file:
         from core.processing.cleaner import TextCleaner
         from core.processing.chunker import HierarchicalChunker
         from core.embeddings.embedder import Embedder
+        from core.embeddings.sparse_encoder import SparseEncoder
         from core.embeddings.vector_store import VectorStore
         
         loader = UniversalLoader()
         cleaner = TextCleaner()
         chunker = HierarchicalChunker()
+        sparse_encoder = SparseEncoder()
         # Initialize Embedder/VectorStore inside try block in case containers aren't ready
         
         # 3. Stream & Display
@@ -71,28 +88,57 @@ if uploaded_file:
         
         all_chunks = []
         
+        # Streamlit reruns this script on every interaction: persist each upload once
+        upload_hash = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+        persisted_uploads = st.session_state.setdefault("persisted_uploads", set())
+        writers = {}
+        if settings.PERSIST_STAGES and upload_hash not in persisted_uploads:
+            from core.storage.stage_store import StageStore, StageWriter
+            stage_store = StageStore()
+            writers = {
+                "extracted": StageWriter(stage_store, "extracted"),
+                "cleaned": StageWriter(stage_store, "cleaned"),
+                "chunks": StageWriter(stage_store, "chunks", params=chunker.params()),
+                "embeddings": StageWriter(stage_store, "embeddings"),
+            }
+        
         try:
             embedder = Embedder()
             vector_store = VectorStore()
             
             for chunk in loader.load(temp_path):
+                if writers:
+                    # process_chunk mutates in place; keep the raw extraction
+                    writers["extracted"].add([{**chunk, "metadata": dict(chunk.get("metadata", {}))}])
+                
                 # A. Clean
                 clean_chunk = cleaner.process_chunk(chunk)
                 
                 # B. Chunk (Hierarchy)
                 hierarchical_chunks = chunker.chunk(clean_chunk)
                 all_chunks.extend(hierarchical_chunks)
+                
+                if writers:
+                    writers["cleaned"].add([clean_chunk])
+                    writers["chunks"].add(hierarchical_chunks)
             
             # C. Embed & Index (Batch Process for speed)
             if all_chunks:
                 with st.spinner(f"Embedding {len(all_chunks)} chunks..."):
                     texts = [c["content"] for c in all_chunks]
                     vectors = embedder.embed(texts)
+                    sparse_vectors = sparse_encoder.encode(texts)
+                    if writers and vectors:
+                        writers["embeddings"].add(all_chunks, vectors=vectors)
                     
-                    vector_store.upsert(all_chunks, vectors)
+                    vector_store.upsert(all_chunks, vectors, sparse_vectors=sparse_vectors)
                     
                 st.success(f"Indexed {len(all_chunks)} chunks to Memory!")
             
+            # Only once every stage got data: e.g. a failed embed must be retried on rerun
+            if writers and all(writer.total for writer in writers.values()):
+                persisted_uploads.add(upload_hash)
+            
             status.update(label="Processing Complete!", state="complete", expanded=False)
             
             # --- Visualization ---
@@ -116,9 +162,11 @@ if uploaded_file:
                 query = st.text_input("Ask a question about this doc:")
                 if query:
                     q_vec = embedder.embed([query])[0]
-                    results = vector_store.search(q_vec, limit=3)
-                    for res in results:
-                        st.success(f"Score: {res['score']:.2f}")
+                    q_sparse = sparse_encoder.encode_query(query)
+                    results = vector_store.hybrid_search(q_vec, q_sparse, limit=3)
+                    # Hybrid scores are RRF (rank-based), not cosine similarity: show the rank
+                    for rank, res in enumerate(results, start=1):
+                        st.success(f"Rank #{rank}")
                         st.markdown(f"> {res['content']}")
 
         except Exception as e:
@@ -128,3 +176,13 @@ if uploaded_file:
         except Exception as e:
             st.error(f"Pipeline Error: {e}")
             logger.error(e)
+        
+        finally:
+            # Also on failure: keep every stage output (e.g. OCR pages) produced so far
+            for writer in writers.values():
+                writer.flush()
+
+if settings.METRICS_ENABLED:
+    with stage_timings.container():
+        with st.expander("Stage Timings (this run)"):
+            st.json(registry.since(timings_before))
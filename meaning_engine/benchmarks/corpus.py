@@ -0,0 +1,199 @@
+import random
+from pathlib import Path
+from typing import Dict, List
+import logging
+
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger("meaning_engine")
+
+# Corpus sizes per scale. Counts are files; pages are per PDF.
+SCALES = {
+    "small": {"digital_pdfs": 2, "scanned_pdfs": 1, "pngs": 1, "text_files": 1,
+              "no_break_pages": 4, "pages": 3, "text_mb": 1, "png_size": (2000, 2600)},
+    "medium": {"digital_pdfs": 8, "scanned_pdfs": 3, "pngs": 3, "text_files": 2,
+               "no_break_pages": 16, "pages": 10, "text_mb": 10, "png_size": (3000, 4000)},
+    "large": {"digital_pdfs": 20, "scanned_pdfs": 6, "pngs": 6, "text_files": 3,
+              "no_break_pages": 64, "pages": 30, "text_mb": 100, "png_size": (5000, 7000)},
+}
+
+_SYLLABLES = ["ka", "ri", "to", "me", "sa", "lo", "vi", "du", "ne", "po", "gra", "tion", "ex", "con", "al"]
+
+class SyntheticCorpus:
+    """
+    Deterministic synthetic inputs for benchmarking. The same seed and scale
+    always produce the same text content, so runs are comparable across commits.
+
+    Generates:
+    - Digital PDFs (real text layer -> pypdf path)
+    - Scanned PDFs (image-only pages -> OCR path)
+    - Large PNGs (OCR)
+    - Huge plain text files
+    - Pages with no paragraph breaks (worst case for the chunker)
+    """
+
+    def __init__(self, root: Path, scale: str = "small", seed: int = 42):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale '{scale}'. Expected one of {list(SCALES)}")
+        self.root = Path(root)
+        self.scale = scale
+        self.seed = seed
+        self.spec = SCALES[scale]
+        self._rng = random.Random(seed)
+        self._vocab = self._build_vocab(2000)
+
+    def generate(self) -> Dict[str, List[Path]]:
+        """
+        Write the corpus to disk. Returns file paths grouped by kind.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        spec = self.spec
+        corpus = {
+            "digital_pdf": [self._digital_pdf(i) for i in range(spec["digital_pdfs"])],
+            "scanned_pdf": [self._scanned_pdf(i) for i in range(spec["scanned_pdfs"])],
+            "png": [self._png(i) for i in range(spec["pngs"])],
+            "text": [self._text_file(i) for i in range(spec["text_files"])],
+        }
+        logger.info(f"Generated {self.scale} benchmark corpus in {self.root}")
+        return corpus
+
+    def no_break_pages(self) -> List[str]:
+        """
+        Pages of a single unbroken run of words: no newlines, no sentence ends.
+        Forces the chunker down to its hard-slice fallback.
+        """
+        return [" ".join(self._words(1500)) for _ in range(self.spec["no_break_pages"])]
+
+    # --- Text ---
+
+    def _build_vocab(self, size: int) -> List[str]:
+        vocab = set()
+        while len(vocab) < size:
+            vocab.add("".join(self._rng.choice(_SYLLABLES) for _ in range(self._rng.randint(1, 4))))
+        return sorted(vocab)
+
+    def _words(self, n: int) -> List[str]:
+        return [self._rng.choice(self._vocab) for _ in range(n)]
+
+    def _identifier(self) -> str:
+        # Part numbers and clause numbers, the tokens keyword search must keep intact
+        if self._rng.random() < 0.5:
+            return f"{self._rng.choice('ABCDEFGH')}{self._rng.choice('XYZ')}-{self._rng.randint(1000, 9999)}"
+        return ".".join(str(self._rng.randint(1, 12)) for _ in range(3))
+
+    def sentence(self) -> str:
+        words = self._words(self._rng.randint(6, 22))
+        if self._rng.random() < 0.2:
+            words.insert(self._rng.randrange(len(words)), self._identifier())
+        return " ".join(words).capitalize() + "."
+
+    def paragraph(self) -> str:
+        return " ".join(self.sentence() for _ in range(self._rng.randint(3, 8)))
+
+    def page_text(self, paragraphs: int = 6) -> str:
+        return "\n\n".join(self.paragraph() for _ in range(paragraphs))
+
+    def _text_file(self, idx: int) -> Path:
+        path = self.root / f"huge_{idx}.txt"
+        target = self.spec["text_mb"] * 1024 * 1024
+        written = 0
+        with open(path, "w", encoding="utf-8") as f:
+            while written < target:
+                block = self.page_text() + "\n\n"
+                f.write(block)
+                written += len(block)
+        return path
+
+    # --- PDFs ---
+
+    def _digital_pdf(self, idx: int) -> Path:
+        path = self.root / f"digital_{idx}.pdf"
+        pages = [self._wrap(self.page_text(), 90)[:60] for _ in range(self.spec["pages"])]
+        path.write_bytes(_text_pdf_bytes(pages))
+        return path
+
+    def _scanned_pdf(self, idx: int) -> Path:
+        path = self.root / f"scanned_{idx}.pdf"
+        images = [self._render(self.page_text(4), (1240, 1754)) for _ in range(self.spec["pages"])]
+        images[0].save(path, "PDF", resolution=150.0, save_all=True, append_images=images[1:])
+        return path
+
+    def _png(self, idx: int) -> Path:
+        path = self.root / f"large_{idx}.png"
+        width, height = self.spec["png_size"]
+        text = "\n\n".join(self.page_text() for _ in range(max(1, height // 1200)))
+        self._render(text, (width, height)).save(path, "PNG")
+        return path
+
+    # --- Rendering helpers ---
+
+    @staticmethod
+    def _wrap(text: str, width: int) -> List[str]:
+        lines = []
+        for para in text.split("\n\n"):
+            line = ""
+            for word in para.split():
+                if len(line) + len(word) + 1 > width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = f"{line} {word}".strip()
+            lines.extend([line, ""])
+        return lines
+
+    def _render(self, text: str, size) -> Image.Image:
+        img = Image.new("L", size, color=255)
+        draw = ImageDraw.Draw(img)
+        try:
+            font = ImageFont.load_default(size=24)
+        except TypeError:
+            # Pillow < 10.1 has a single fixed-size bitmap font
+            font = ImageFont.load_default()
+        char_width = draw.textlength("abcdefghijklmnopqrstuvwxyz", font=font) / 26
+        y = 40
+        for line in self._wrap(text, max(20, int((size[0] - 80) / (char_width * 1.1)))):
+            if y > size[1] - 60:
+                break
+            draw.text((40, y), line, fill=0, font=font)
+            y += 32
+        return img
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _text_pdf_bytes(pages: List[List[str]]) -> bytes:
+    """
+    Minimal PDF with a real text layer (Helvetica, one content stream per page).
+    Avoids pulling in a PDF authoring library just for benchmarks.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,66 @@
+import math
+import sys
+import time
+from typing import Callable, Iterable, Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the current process, in MB (None where unsupported).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile (no interpolation, stable for small samples).
+    None for no samples: NaN is not valid JSON.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def measure(items: Iterable[Any], fn: Callable[[Any], int], unit: str) -> Dict[str, Any]:
+    """
+    Time fn over each item. fn returns how many units (pages, chunks, ...) it produced.
+    """
+    setup_rss = peak_rss_mb()
+    latencies = []
+    units = 0
+
+    start = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        units += fn(item)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    wall = time.perf_counter() - start
+
+    return {
+        "status": "ok",
+        "items": len(latencies),
+        "units": units,
+        "unit": unit,
+        "wall_s": round(wall, 4),
+        "throughput_per_s": round(units / wall, 3) if wall > 0 else None,
+        "items_per_s": round(len(latencies) / wall, 3) if wall > 0 else None,
+        "latency_ms": {
+            "p50": _round(percentile(latencies, 50), 3),
+            "p99": _round(percentile(latencies, 99), 3),
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "max": round(max(latencies), 3) if latencies else None,
+        },
+        "setup_peak_rss_mb": _round(setup_rss, 1),
+        "peak_rss_mb": _round(peak_rss_mb(), 1),
+    }
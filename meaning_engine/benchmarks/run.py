@@ -0,0 +1,285 @@
+"""
+Benchmark harness for the ingestion and search pipeline.
+
+Usage (from the meaning_engine directory):
+
+    python -m benchmarks.run --scale small --seed 42
+    python -m benchmarks.run --stages chunk clean --out results/bench.json
+
+Each stage runs in its own spawned process, so peak RSS is per stage and one
+stage's caches or loaded models never skew another. Qdrant runs in-process
+(":memory:"), no server required. Results are written as JSON.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import random
+import subprocess
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Any, List
+
+from benchmarks.corpus import SyntheticCorpus
+from benchmarks.harness import measure
+
+logger = logging.getLogger("meaning_engine")
+
+EMBED_BATCH = 256
+UPSERT_BATCH = 256
+SEARCH_QUERIES = 100
+VECTOR_DIM = 384  # Matches the collection created by VectorStore
+
+STAGE_POLL_S = 5
+
+# --- Stage setups: build inputs (untimed), return (items, fn, unit[, verify]) ---
+# fn raises when a call silently did nothing (VectorStore logs and swallows errors);
+# verify() runs after timing and raises if the end state is wrong.
+
+def _text_pages(synthetic: SyntheticCorpus, corpus: Dict[str, List[Path]]) -> List[str]:
+    """
+    Huge text files cut into ~page-sized pieces, plus the no-break pages.
+    """
+    pages = []
+    for path in corpus["text"]:
+        text = path.read_text(encoding="utf-8")
+        paragraphs = text.split("\n\n")
+        pages.extend("\n\n".join(paragraphs[i:i + 6]) for i in range(0, len(paragraphs), 6))
+    return pages + synthetic.no_break_pages()
+
+def _page_dicts(pages: List[str]) -> List[Dict[str, Any]]:
+    return [{"content": p, "page": i + 1, "metadata": {"source": "bench.txt"}} for i, p in enumerate(pages)]
+
+def _micro_texts(synthetic, corpus) -> List[str]:
+    from core.processing.chunker import HierarchicalChunker
+    chunker = HierarchicalChunker()
+    chunks = [c for page in _page_dicts(_text_pages(synthetic, corpus)) for c in chunker.chunk(page)]
+    return [c["content"] for c in chunks if c["level"] == "micro"]
+
+def _batches(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _setup_detect(synthetic, corpus):
+    from core.extraction.detector import FileTypeDetector
+    files = [p for paths in corpus.values() for p in paths]
+
+    def detect(path) -> int:
+        FileTypeDetector.detect(path)
+        return 1
+    return files, detect, "files"
+
+def _setup_extractor(kind: str):
+    def setup(synthetic, corpus):
+        if kind == "png":
+            from core.extraction.image import ImageExtractor
+            extractor = ImageExtractor()
+        else:
+            from core.extraction.pdf_stream import PDFExtractor
+            extractor = PDFExtractor()
+        return corpus[kind], lambda p: sum(1 for _ in extractor.stream(p)), "pages"
+    return setup
+
+def _setup_clean(synthetic, corpus):
+    from core.processing.cleaner import TextCleaner
+
+    def clean(text: str) -> int:
+        TextCleaner.clean(text)
+        return 1
+    return _text_pages(synthetic, corpus), clean, "pages"
+
+def _setup_chunk(synthetic, corpus):
+    from core.processing.chunker import HierarchicalChunker
+    chunker = HierarchicalChunker()
+    return _page_dicts(_text_pages(synthetic, corpus)), lambda page: len(chunker.chunk(page)), "chunks"
+
+def _setup_embed(synthetic, corpus):
+    from core.embeddings.embedder import Embedder
+    embedder = Embedder()
+    return _batches(_micro_texts(synthetic, corpus), EMBED_BATCH), lambda b: len(embedder.embed(b)), "texts"
+
+def _indexable(synthetic, corpus):
+    """
+    Micro chunks with deterministic random vectors, so the store is timed
+    independently of the embedding model.
+    """
+    from core.embeddings.sparse_encoder import SparseEncoder
+    texts = _micro_texts(synthetic, corpus)
+    rng = random.Random(synthetic.seed)
+    chunks = [
+        {"chunk_id": f"bench_{i}", "content": t, "level": "micro", "metadata": {"source": "bench.txt"}}
+        for i, t in enumerate(texts)
+    ]
+    vectors = [[rng.uniform(-1, 1) for _ in range(VECTOR_DIM)] for _ in texts]
+    return chunks, vectors, SparseEncoder().encode(texts)
+
+def _point_count(store) -> int:
+    return store.client.count(collection_name=store.collection_name, exact=True).count
+
+def _expect_points(store, expected: int):
+    def verify():
+        stored = _point_count(store)
+        if stored != expected:
+            raise RuntimeError(f"Expected {expected} points in Qdrant after upsert, found {stored}")
+    return verify
+
+def _setup_upsert(synthetic, corpus):
+    from core.embeddings.vector_store import VectorStore
+    store = VectorStore()
+    chunks, vectors, sparse = _indexable(synthetic, corpus)
+    batches = list(zip(_batches(chunks, UPSERT_BATCH), _batches(vectors, UPSERT_BATCH), _batches(sparse, UPSERT_BATCH)))
+
+    def upsert(batch):
+        store.upsert(*batch[:2], sparse_vectors=batch[2])
+        return len(batch[0])
+    return batches, upsert, "points", _expect_points(store, len(chunks))
+
+def _setup_search(synthetic, corpus):
+    from core.embeddings.vector_store import VectorStore
+    from core.embeddings.sparse_encoder import SparseEncoder
+    store = VectorStore()
+    encoder = SparseEncoder()
+    chunks, vectors, sparse = _indexable(synthetic, corpus)
+    for batch in zip(_batches(chunks, UPSERT_BATCH), _batches(vectors, UPSERT_BATCH), _batches(sparse, UPSERT_BATCH)):
+        store.upsert(*batch[:2], sparse_vectors=batch[2])
+    _expect_points(store, len(chunks))()
+
+    rng = random.Random(synthetic.seed + 1)
+    queries = [(vectors[rng.randrange(len(vectors))], synthetic.sentence()) for _ in range(SEARCH_QUERIES)]
+
+    def search(query):
+        vector, text = query
+        hits = store.hybrid_search(vector, encoder.encode_query(text), limit=5)
+        if not hits:
+            raise RuntimeError("Search returned no hits from a populated collection")
+        return len(hits)
+    return queries, search, "hits"
+
+def _setup_end_to_end(synthetic, corpus):
+    from core.ingestion.loader import UniversalLoader
+    from core.processing.cleaner import TextCleaner
+    from core.processing.chunker import HierarchicalChunker
+    from core.embeddings.embedder import Embedder
+    from core.embeddings.sparse_encoder import SparseEncoder
+    from core.embeddings.vector_store import VectorStore
+    loader, cleaner, chunker = UniversalLoader(), TextCleaner(), HierarchicalChunker()
+    embedder, encoder, store = Embedder(), SparseEncoder(), VectorStore()
+    chunk_ids = set()
+
+    def ingest(path):
+        chunks = [c for page in loader.load(path) for c in chunker.chunk(cleaner.process_chunk(page))]
+        if chunks:
+            texts = [c["content"] for c in chunks]
+            store.upsert(chunks, embedder.embed(texts), sparse_vectors=encoder.encode(texts))
+            chunk_ids.update(c["chunk_id"] for c in chunks)
+        return len(chunks)
+
+    def verify():
+        _expect_points(store, len(chunk_ids))()
+    return corpus["digital_pdf"] + corpus["scanned_pdf"] + corpus["png"], ingest, "chunks", verify
+
+STAGES = {
+    "detect": _setup_detect,
+    "extract_digital_pdf": _setup_extractor("digital_pdf"),
+    "extract_scanned_pdf": _setup_extractor("scanned_pdf"),
+    "extract_image": _setup_extractor("png"),
+    "clean": _setup_clean,
+    "chunk": _setup_chunk,
+    "embed": _setup_embed,
+    "upsert": _setup_upsert,
+    "search": _setup_search,
+    "end_to_end": _setup_end_to_end,
+}
+
+def _run_stage(name: str, root: str, scale: str, seed: int, corpus: Dict[str, List[Path]], queue):
+    """
+    Child process entry point. Must set env before core.config is imported.
+    """
+    os.environ["QDRANT_LOCATION"] = ":memory:"
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        synthetic = SyntheticCorpus(Path(root), scale=scale, seed=seed)
+        items, fn, unit, *verify = STAGES[name](synthetic, corpus)
+        result = measure(items, fn, unit)
+        if verify:
+            verify[0]()
+        queue.put(result)
+    except Exception as e:
+        queue.put({"status": "error", "error": f"{type(e).__name__}: {e}", "trace": traceback.format_exc()})
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+def run(stages: List[str], scale: str, seed: int, corpus_dir: Path) -> Dict[str, Any]:
+    logger.info(f"Generating {scale} corpus (seed={seed}) in {corpus_dir}")
+    corpus = SyntheticCorpus(corpus_dir, scale=scale, seed=seed).generate()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": scale,
+            "seed": seed,
+        },
+        "stages": {},
+    }
+
+    ctx = multiprocessing.get_context("spawn")
+    for name in stages:
+        logger.info(f"Running stage: {name}")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_stage, args=(name, str(corpus_dir), scale, seed, corpus, queue))
+        proc.start()
+        # Read before join: a child blocked on a full pipe would never exit
+        while True:
+            try:
+                result = queue.get(timeout=STAGE_POLL_S)
+                break
+            except queue_module.Empty:
+                if not proc.is_alive():
+                    result = {"status": "error", "error": f"Stage process exited with code {proc.exitcode}"}
+                    break
+        proc.join()
+        report["stages"][name] = result
+        if result["status"] == "ok":
+            logger.info(
+                f"{name}: {result['throughput_per_s']} {result['unit']}/s, "
+                f"p50={result['latency_ms']['p50']}ms p99={result['latency_ms']['p99']}ms, "
+                f"peak RSS={result['peak_rss_mb']}MB"
+            )
+        else:
+            logger.warning(f"{name} failed: {result['error']}")
+    return report
+
+def main():
+    from core.config import settings
+
+    parser = argparse.ArgumentParser(description="Meaning Engine benchmarks")
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--corpus-dir", type=Path, default=settings.RESULTS_DIR / "benchmarks" / "corpus")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    report = run(args.stages, args.scale, args.seed, args.corpus_dir / f"{args.scale}-{args.seed}")
+
+    out = args.out or settings.RESULTS_DIR / "benchmarks" / f"{report['meta']['commit']}-{args.scale}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, allow_nan=False))
+    logger.info(f"Report written to {out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -16,6 +17,7 @@ class Settings(BaseSettings):
     # --- Qdrant (Memory) ---
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
+    QDRANT_LOCATION: Optional[str] = None  # e.g. ":memory:" to run Qdrant in-process
     COLLECTION_NAME: str = "universal_knowledge"
 
     # --- Massive File Handling ---
@@ -24,12 +26,32 @@ class Settings(BaseSettings):
 
     # --- Embeddings ---
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # --- Sparse (BM25) / Hybrid Retrieval ---
+    SPARSE_VECTOR_NAME: str = "bm25"
+    BM25_K1: float = 1.2
+    BM25_B: float = 0.75
+    BM25_AVG_DOC_LEN: float = 100.0  # tokens; approx. for a mix of micro/meso chunks
+    HYBRID_PREFETCH_LIMIT: int = 50  # candidates per retriever before fusion
     
     # --- Chunking Hierarchy ---
     CHUNK_MICRO: int = 500
     CHUNK_MESO: int = 2000
     CHUNK_MACRO: int = 10000
 
+    # --- Stage Persistence (Parquet) ---
+    PERSIST_STAGES: bool = False
+    STAGE_STORE_DIR: Optional[Path] = None  # Defaults to RESULTS_DIR / "stages"
+    STAGE_SCAN_BATCH_SIZE: int = 1024
+    STAGE_WRITE_BATCH_SIZE: int = 256  # Records buffered per stage before a part file is written
+
+    # --- Observability ---
+    METRICS_ENABLED: bool = False  # Off: instrumented functions are left unwrapped
+    METRICS_EXPORTER: str = "prometheus"  # /metrics is always served; "otel" additionally emits OTel spans
+    METRICS_PORT: int = 9464
+    PROFILE_SLOW_DOCS_MS: Optional[int] = None  # Sample stacks per document; dump if slower than this
+    PROFILE_SAMPLE_INTERVAL_MS: int = 10
+
     # --- Logging ---
     LOG_LEVEL: str = "INFO"
     LOG_CONFIG_PATH: Path = BASE_DIR / "meaning_engine" / "logging.yaml"
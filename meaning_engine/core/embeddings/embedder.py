@@ -2,6 +2,7 @@ from sentence_transformers import SentenceTransformer
 from typing import List
 import logging
 from core.config import settings
+from core.observability.instrumentation import traced, error
 
 logger = logging.getLogger("meaning_engine")
 
@@ -27,6 +28,7 @@ class Embedder:
             logger.critical(f"Failed to load embedding model: {e}")
             raise
 
+    @traced("embed", items=len)
     def embed(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a list of texts.
@@ -39,5 +41,6 @@ class Embedder:
             embeddings = self._model.encode(texts, batch_size=32, convert_to_numpy=True)
             return embeddings.tolist()
         except Exception as e:
+            error("embed")
             logger.error(f"Embedding generation failed: {e}")
             return []
@@ -0,0 +1,69 @@
+import re
+import zlib
+from collections import Counter
+from typing import List, Dict, Any
+from core.config import settings
+
+# Keeps identifiers such as "AB-1234", "4.2.1" or "x_ray" together as one token
+TOKEN_PATTERN = re.compile(r"\w+(?:[-./]\w+)*")
+COMPOUND_SEPARATORS = re.compile(r"[-./]")
+
+class SparseEncoder:
+    """
+    BM25-style sparse vectors for keyword retrieval.
+    Term frequencies are saturated client-side; IDF is applied by Qdrant
+    (sparse vector modifier) so the index never needs a corpus-wide pass.
+    """
+
+    def __init__(self):
+        self.k1 = settings.BM25_K1
+        self.b = settings.BM25_B
+        self.avg_doc_len = settings.BM25_AVG_DOC_LEN
+
+    @staticmethod
+    def tokenize(text: str, split_compounds: bool = True) -> List[str]:
+        """
+        Lowercased word tokens. With split_compounds, compound identifiers are
+        emitted whole and as their parts, so a document containing "AB-1234"
+        matches queries for both "ab-1234" and "1234".
+        """
+        tokens = []
+        for match in TOKEN_PATTERN.finditer(text.lower()):
+            token = match.group(0)
+            tokens.append(token)
+            if split_compounds and COMPOUND_SEPARATORS.search(token):
+                tokens.extend(p for p in COMPOUND_SEPARATORS.split(token) if p)
+        return tokens
+
+    @staticmethod
+    def _term_id(token: str) -> int:
+        # crc32 is stable across processes (unlike hash()) and fits Qdrant's uint32 indices
+        return zlib.crc32(token.encode("utf-8"))
+
+    def encode(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Document-side vectors: {"indices": [...], "values": [...]} per text.
+        """
+        vectors = []
+        for text in texts:
+            tokens = self.tokenize(text or "")
+            doc_len = len(tokens)
+            norm = self.k1 * (1 - self.b + self.b * doc_len / self.avg_doc_len)
+
+            weights: Dict[int, float] = {}
+            for token, tf in Counter(tokens).items():
+                term_id = self._term_id(token)
+                # Hash collisions are rare; merge them rather than drop a term
+                weights[term_id] = weights.get(term_id, 0.0) + tf * (self.k1 + 1) / (tf + norm)
+
+            vectors.append({"indices": list(weights.keys()), "values": list(weights.values())})
+        return vectors
+
+    def encode_query(self, text: str) -> Dict[str, Any]:
+        """
+        Query-side vector: each distinct term weighted 1.0 (BM25 scores the document side).
+        Compounds are not split here: "4.2.1" must not match any chunk with a 4, 2 and 1.
+        The document side already indexes the parts for partial matches.
+        """
+        term_ids = sorted({self._term_id(t) for t in self.tokenize(text or "", split_compounds=False)})
+        return {"indices": term_ids, "values": [1.0] * len(term_ids)}
@@ -1,18 +1,26 @@
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
+import uuid
 from core.config import settings
+from core.observability.instrumentation import traced, count, error
 
 logger = logging.getLogger("meaning_engine")
 
 class VectorStore:
     def __init__(self):
-        self.client = QdrantClient(
-            host=settings.QDRANT_HOST, 
-            port=settings.QDRANT_PORT
-        )
+        if settings.QDRANT_LOCATION:
+            # Local mode (e.g. ":memory:") for tests and benchmarks, no server needed
+            self.client = QdrantClient(location=settings.QDRANT_LOCATION)
+        else:
+            self.client = QdrantClient(
+                host=settings.QDRANT_HOST, 
+                port=settings.QDRANT_PORT
+            )
         self.collection_name = settings.COLLECTION_NAME
+        self.sparse_name = settings.SPARSE_VECTOR_NAME
+        self.hybrid_enabled = False
         self._ensure_collection()
 
     def _ensure_collection(self):
@@ -30,15 +38,37 @@ class VectorStore:
                     vectors_config=models.VectorParams(
                         size=384, # Match MiniLM-L6-v2
                         distance=models.Distance.COSINE
-                    )
+                    ),
+                    sparse_vectors_config={
+                        # IDF is computed by Qdrant from live collection stats
+                        self.sparse_name: models.SparseVectorParams(modifier=models.Modifier.IDF)
+                    }
                 )
+                self.hybrid_enabled = True
+            else:
+                info = self.client.get_collection(self.collection_name)
+                sparse = info.config.params.sparse_vectors or {}
+                self.hybrid_enabled = self.sparse_name in sparse
+                if not self.hybrid_enabled:
+                    logger.warning(
+                        f"Collection {self.collection_name} has no '{self.sparse_name}' sparse vector. "
+                        "Hybrid search falls back to dense-only; re-create the collection to enable it."
+                    )
         except Exception as e:
             # Fail silently if Qdrant is not up (e.g. during build), but log it.
             logger.warning(f"Could not connect/create Qdrant collection: {e}")
 
-    def upsert(self, chunks: List[Dict[str, Any]], embeddings: List[List[float]]):
+    @traced("vector_store.upsert")
+    def upsert(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        sparse_vectors: Optional[List[Dict[str, Any]]] = None
+    ):
         """
         Uploads vectors and payload to Qdrant.
+        sparse_vectors (from SparseEncoder.encode) are stored alongside the dense
+        vector of the same point, so both indexes are built in one pass.
         """
         if not chunks or not embeddings:
             return
@@ -53,9 +83,17 @@ class VectorStore:
                 **chunk["metadata"]
             }
             
+            vector = embeddings[i]
+            if sparse_vectors and self.hybrid_enabled:
+                vector = {
+                    "": embeddings[i], # Default (unnamed) dense vector
+                    self.sparse_name: models.SparseVector(**sparse_vectors[i])
+                }
+
             points.append(models.PointStruct(
-                id=chunk["chunk_id"], # Can use hash or UUID if not string-compatible, but string works in recent Qdrant
-                vector=embeddings[i],
+                # Qdrant only accepts ints/UUIDs as ids; derive a stable UUID (chunk_id stays in payload)
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, chunk["chunk_id"])),
+                vector=vector,
                 payload=payload
             ))
 
@@ -64,24 +102,70 @@ class VectorStore:
                 collection_name=self.collection_name,
                 points=points
             )
+            count("vector_store.upsert", len(points))
             logger.info(f"Indexed {len(points)} chunks into {self.collection_name}")
         except Exception as e:
+            error("vector_store.upsert")
             logger.error(f"Indexing failed: {e}")
 
+    @traced("vector_store.search", items=len)
     def search(self, query_vector: List[float], limit: int = 5) -> List[Dict[str, Any]]:
         """
         Semantic search.
         """
         try:
-            results = self.client.search(
+            # query_points replaces client.search, which newer clients removed
+            response = self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_vector,
-                limit=limit
+                query=query_vector,
+                limit=limit,
+                with_payload=True
             )
             return [
                 {"score": hit.score, "content": hit.payload.get("content"), "metadata": hit.payload}
-                for hit in results
+                for hit in response.points
             ]
         except Exception as e:
+            error("vector_store.search")
             logger.error(f"Search failed: {e}")
             return []
+
+    @traced("vector_store.hybrid_search", items=len)
+    def hybrid_search(
+        self,
+        query_vector: List[float],
+        query_sparse: Dict[str, Any],
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Dense + sparse (BM25) search merged with Reciprocal Rank Fusion.
+        Both retrievers run as prefetches inside a single Qdrant request,
+        so they execute concurrently server-side with one network round trip.
+        """
+        if not self.hybrid_enabled or not query_sparse.get("indices"):
+            return self.search(query_vector, limit=limit)
+
+        prefetch_limit = max(settings.HYBRID_PREFETCH_LIMIT, limit)
+        try:
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=[
+                    models.Prefetch(query=query_vector, limit=prefetch_limit),
+                    models.Prefetch(
+                        query=models.SparseVector(**query_sparse),
+                        using=self.sparse_name,
+                        limit=prefetch_limit
+                    ),
+                ],
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                limit=limit,
+                with_payload=True
+            )
+            return [
+                {"score": hit.score, "content": hit.payload.get("content"), "metadata": hit.payload}
+                for hit in response.points
+            ]
+        except Exception as e:
+            error("vector_store.hybrid_search")
+            logger.error(f"Hybrid search failed: {e}")
+            return []
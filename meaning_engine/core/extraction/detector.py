@@ -2,6 +2,7 @@ import magic
 from pathlib import Path
 from enum import Enum
 import logging
+from core.observability.instrumentation import traced
 
 logger = logging.getLogger("meaning_engine")
 
@@ -15,6 +16,7 @@ class FileType(str, Enum):
 
 class FileTypeDetector:
     @staticmethod
+    @traced("detect")
     def detect(file_path: Path) -> FileType:
         """
         Detects the file type using python-magic (libmagic).
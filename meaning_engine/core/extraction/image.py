@@ -4,10 +4,12 @@ from pathlib import Path
 from typing import Generator, Dict, Any
 import logging
 from core.extraction.base import BaseExtractor
+from core.observability.instrumentation import traced, span
 
 logger = logging.getLogger("meaning_engine")
 
 class ImageExtractor(BaseExtractor):
+    @traced("extract.image")
     def stream(self, file_path: Path) -> Generator[Dict[str, Any], None, None]:
         """
         Extract text from images using OCR.
@@ -17,7 +19,8 @@ class ImageExtractor(BaseExtractor):
             img = Image.open(file_path)
             
             # Extract text
-            text = pytesseract.image_to_string(img)
+            with span("extract.image.tesseract"):
+                text = pytesseract.image_to_string(img)
             
             # Simple heuristic for confidence (Tesseract has detailed data, simplified here)
             # Future: Use image_to_data for word-level confidence
@@ -2,10 +2,12 @@ from pathlib import Path
 from typing import Generator, Dict, Any
 import logging
 from core.extraction.base import BaseExtractor
+from core.observability.instrumentation import traced
 
 logger = logging.getLogger("meaning_engine")
 
 class MediaExtractor(BaseExtractor):
+    @traced("extract.media")
     def stream(self, file_path: Path) -> Generator[Dict[str, Any], None, None]:
         """
         Extract text from Audio/Video.
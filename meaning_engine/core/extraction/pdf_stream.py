@@ -5,10 +5,12 @@ from pathlib import Path
 from typing import Generator, Dict, Any
 import logging
 from core.extraction.base import BaseExtractor
+from core.observability.instrumentation import traced, span, error
 
 logger = logging.getLogger("meaning_engine")
 
 class PDFExtractor(BaseExtractor):
+    @traced("extract.pdf")
     def stream(self, file_path: Path) -> Generator[Dict[str, Any], None, None]:
         """
         Stream PDF pages.
@@ -22,7 +24,8 @@ class PDFExtractor(BaseExtractor):
             logger.info(f"Processing PDF: {file_path.name} ({total_pages} pages)")
 
             for page_num, page in enumerate(reader.pages):
-                text = page.extract_text() or ""
+                with span("extract.pdf.pypdf"):
+                    text = page.extract_text() or ""
                 
                 # Heuristic: If text is very short, it's likely a scan or image-heavy page
                 is_scanned = len(text.strip()) < 50
@@ -49,24 +52,28 @@ class PDFExtractor(BaseExtractor):
             logger.error(f"Error reading PDF {file_path}: {e}")
             raise
 
+    @traced("extract.pdf.ocr_page")
     def _ocr_page(self, file_path: Path, page_num: int) -> str:
         """
         Render specific page to image and transcribe.
         """
         try:
             # Convert single page to image (lazy)
-            images = convert_from_path(
-                str(file_path), 
-                first_page=page_num, 
-                last_page=page_num
-            )
+            with span("extract.pdf.render"):
+                images = convert_from_path(
+                    str(file_path), 
+                    first_page=page_num, 
+                    last_page=page_num
+                )
             if not images:
                 return ""
             
             # Run Tesseract
             # We can capture confidence data here if we use image_to_data
-            text = pytesseract.image_to_string(images[0])
+            with span("extract.pdf.tesseract"):
+                text = pytesseract.image_to_string(images[0])
             return text
         except Exception as e:
+            error("extract.pdf.ocr_page")
             logger.error(f"OCR Failed for page {page_num}: {e}")
             return ""
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Generator, Dict, Any
 from core.extraction.detector import FileTypeDetector, FileType
 from core.extraction.pdf_stream import PDFExtractor
+from core.observability.instrumentation import profile_document
 import logging
 
 logger = logging.getLogger("meaning_engine")
@@ -37,4 +38,5 @@ class UniversalLoader:
             logger.warning(f"No extractor for {file_type}. Skipping.")
             return
 
-        yield from extractor.stream(file_path)
+        with profile_document(file_path.name):
+            yield from extractor.stream(file_path)
@@ -0,0 +1,353 @@
+import contextlib
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any, Optional
+import logging
+from core.config import settings
+
+logger = logging.getLogger("meaning_engine")
+
+# Seconds. Spans range from sub-ms (chunking a page) to minutes (OCR of a large scan).
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process store for span durations and counters.
+    Rendered on demand in Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[tuple, float] = {}
+
+    def observe(self, span: str, seconds: float):
+        with self._lock:
+            hist = self._durations.get(span)
+            if hist is None:
+                hist = self._durations[span] = {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += seconds
+            hist["count"] += 1
+
+    def inc(self, metric: str, span: str, value: float = 1):
+        with self._lock:
+            self._counters[(metric, span)] = self._counters.get((metric, span), 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Per-span summary: calls, total/mean seconds, items and errors.
+        """
+        with self._lock:
+            return {
+                span: {
+                    "calls": hist["count"],
+                    "total_s": round(hist["sum"], 6),
+                    "mean_s": round(hist["sum"] / hist["count"], 6) if hist["count"] else 0.0,
+                    "items": self._counters.get(("items", span), 0),
+                    "errors": self._counters.get(("errors", span), 0),
+                }
+                for span, hist in self._durations.items()
+            }
+
+    def since(self, before: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Snapshot minus an earlier snapshot, e.g. the spans of one pipeline run.
+        Spans with no activity in between are left out.
+        """
+        delta = {}
+        for span, now in self.snapshot().items():
+            prev = before.get(span, {})
+            calls = now["calls"] - prev.get("calls", 0)
+            items = now["items"] - prev.get("items", 0)
+            errors = now["errors"] - prev.get("errors", 0)
+            if not (calls or items or errors):
+                continue
+            total = now["total_s"] - prev.get("total_s", 0.0)
+            delta[span] = {
+                "calls": calls,
+                "total_s": round(total, 6),
+                "mean_s": round(total / calls, 6) if calls else 0.0,
+                "items": items,
+                "errors": errors,
+            }
+        return delta
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP meaning_engine_span_duration_seconds Time spent in instrumented pipeline stages.",
+            "# TYPE meaning_engine_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            for span, hist in sorted(self._durations.items()):
+                label = _label(span)
+                for bound, count in zip(DURATION_BUCKETS, hist["buckets"]):
+                    lines.append(f'meaning_engine_span_duration_seconds_bucket{{span="{label}",le="{bound}"}} {count}')
+                lines.append(f'meaning_engine_span_duration_seconds_bucket{{span="{label}",le="+Inf"}} {hist["count"]}')
+                lines.append(f'meaning_engine_span_duration_seconds_sum{{span="{label}"}} {hist["sum"]}')
+                lines.append(f'meaning_engine_span_duration_seconds_count{{span="{label}"}} {hist["count"]}')
+
+            for metric, help_text in (
+                ("items", "Items produced per stage (pages, chunks, vectors, points)."),
+                ("errors", "Exceptions raised out of instrumented stages."),
+            ):
+                lines.append(f"# HELP meaning_engine_span_{metric}_total {help_text}")
+                lines.append(f"# TYPE meaning_engine_span_{metric}_total counter")
+                for (name, span), value in sorted(self._counters.items()):
+                    if name == metric:
+                        lines.append(f'meaning_engine_span_{metric}_total{{span="{_label(span)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+registry = MetricsRegistry()
+
+# --- OpenTelemetry (optional) ---
+
+_tracer = None
+if settings.METRICS_ENABLED and settings.METRICS_EXPORTER == "otel":
+    try:
+        from opentelemetry import trace
+        # Exporter/SDK setup is left to the host process (OTEL_* env vars or code)
+        _tracer = trace.get_tracer("meaning_engine")
+    except ImportError:
+        logger.warning("METRICS_EXPORTER=otel but opentelemetry-api is not installed. Spans go to /metrics only.")
+
+def _otel_span(name: str):
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(name)
+
+# --- Spans ---
+
+def count(span: str, value: float):
+    """
+    Add to a span's item counter from inside a function (e.g. points upserted).
+    """
+    if settings.METRICS_ENABLED:
+        registry.inc("items", span, value)
+
+def error(span: str):
+    """
+    Count a failure that the stage handles itself (logs and returns an empty result),
+    which @traced cannot see since no exception escapes.
+    """
+    if settings.METRICS_ENABLED:
+        registry.inc("errors", span)
+
+class _Span:
+    def __init__(self, name: str):
+        self.name = name
+        self._otel = None
+
+    def __enter__(self):
+        self._otel = _otel_span(self.name)
+        self._otel.__enter__()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        _record(self.name, time.perf_counter() - self._t0, None, failed)
+        return self._otel.__exit__(exc_type, exc, tb)
+
+_NOOP_SPAN = contextlib.nullcontext()
+
+def span(name: str):
+    """
+    Time a block inside a function, e.g. the render and OCR steps of one page:
+
+        with span("extract.pdf.render"):
+            ...
+
+    Returns a shared no-op context manager when METRICS_ENABLED is off.
+    """
+    if not settings.METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _Span(name)
+
+def traced(name: str, items: Optional[Callable[[Any], int]] = None):
+    """
+    Record a timing span around a function.
+
+    - items: optional callable mapping the return value to an item count.
+    - Generator functions are timed only while they run (time the consumer
+      spends between yields is excluded) and count their yields as items.
+
+    With METRICS_ENABLED off, the function is returned unwrapped: zero overhead.
+    """
+    def decorator(fn):
+        if not settings.METRICS_ENABLED:
+            return fn
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                # Not "current" span: context cannot stay attached across yields
+                otel = _tracer.start_span(name) if _tracer else None
+                elapsed, produced, failed = 0.0, 0, False
+                gen = fn(*args, **kwargs)
+                try:
+                    while True:
+                        t0 = time.perf_counter()
+                        try:
+                            item = next(gen)
+                        except StopIteration:
+                            return
+                        finally:
+                            elapsed += time.perf_counter() - t0
+                        produced += 1
+                        yield item
+                except Exception:
+                    failed = True
+                    raise
+                finally:
+                    gen.close()
+                    _record(name, elapsed, produced, failed)
+                    if otel:
+                        otel.end()
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            with _otel_span(name):
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception:
+                    _record(name, time.perf_counter() - t0, None, True)
+                    raise
+            _record(name, time.perf_counter() - t0, items(result) if items else None, False)
+            return result
+        return wrapper
+    return decorator
+
+def _record(name: str, seconds: float, produced: Optional[int], failed: bool):
+    registry.observe(name, seconds)
+    if produced:
+        registry.inc("items", name, produced)
+    if failed:
+        registry.inc("errors", name)
+
+# --- Prometheus endpoint ---
+
+_server = None
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the application log
+
+def start_metrics_server(port: Optional[int] = None):
+    """
+    Serve /metrics on a daemon thread. Idempotent (safe on Streamlit reruns).
+    Runs in both exporter modes: "otel" adds OTel spans but histograms and
+    counters are only exported here.
+    """
+    global _server
+    if _server is not None or not settings.METRICS_ENABLED:
+        return _server
+    port = port or settings.METRICS_PORT
+    try:
+        _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Could not start metrics server on port {port}: {e}")
+        return None
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Prometheus metrics on :{port}/metrics")
+    return _server
+
+# --- Sampling profiler for slow documents ---
+
+class _StackSampler(threading.Thread):
+    """
+    Samples one thread's Python stack at a fixed interval.
+    Stacks are collapsed to "file:func;file:func count" (flamegraph.pl / speedscope input).
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="doc-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _dump_profile(source: str, seconds: float, samples: Dict[str, int]):
+    profile_dir = settings.LOGS_DIR / "profiles"
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / f"{source}-{int(time.time())}.folded"
+    path.write_text("".join(f"{stack} {n}\n" for stack, n in samples.items()))
+    logger.warning(f"Slow document {source} ({seconds:.1f}s). Stack samples written to {path}")
+
+_slow_document_hook: Callable[[str, float, Dict[str, int]], None] = _dump_profile
+
+def set_slow_document_hook(hook: Callable[[str, float, Dict[str, int]], None]):
+    """
+    Replace the default handler (folded stacks under LOGS_DIR/profiles).
+    hook(source, seconds, {collapsed_stack: sample_count})
+    """
+    global _slow_document_hook
+    _slow_document_hook = hook
+
+@contextlib.contextmanager
+def profile_document(source: str):
+    """
+    Sample the current thread while a document is processed; hand the
+    samples to the slow-document hook if it exceeded PROFILE_SLOW_DOCS_MS.
+    No-op unless PROFILE_SLOW_DOCS_MS is set.
+    """
+    if settings.PROFILE_SLOW_DOCS_MS is None:
+        yield
+        return
+
+    sampler = _StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    t0 = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        elapsed = time.perf_counter() - t0
+        if elapsed * 1000 >= settings.PROFILE_SLOW_DOCS_MS and sampler.samples:
+            try:
+                _slow_document_hook(source, elapsed, dict(sampler.samples))
+            except Exception as e:
+                logger.error(f"Slow document hook failed: {e}")
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Generator
 import re
 from core.config import settings
+from core.observability.instrumentation import traced
 
 class HierarchicalChunker:
     """
@@ -14,7 +15,14 @@ class HierarchicalChunker:
         self.micro_size = settings.CHUNK_MICRO
         self.meso_size = settings.CHUNK_MESO
         self.overlap = 100 # tokens/chars approx
+
+    def params(self) -> Dict[str, Any]:
+        """
+        Settings that determine the output; persisted alongside stored chunks.
+        """
+        return {"micro_size": self.micro_size, "meso_size": self.meso_size, "overlap": self.overlap}
         
+    @traced("chunk", items=len)
     def chunk(self, processed_chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Takes a processed extraction chunk (usually a page) and breaks it down.
@@ -2,6 +2,7 @@ import re
 import unicodedata
 import logging
 from typing import Dict, Any
+from core.observability.instrumentation import traced
 
 logger = logging.getLogger("meaning_engine")
 
@@ -11,6 +12,7 @@ class TextCleaner:
     """
     
     @staticmethod
+    @traced("clean")
     def clean(text: str) -> str:
         if not text:
             return ""
@@ -0,0 +1,72 @@
+from typing import Generator, Dict, Any, List, Tuple, Optional
+import contextlib
+import logging
+from core.embeddings.sparse_encoder import SparseEncoder
+from core.storage.stage_store import StageStore, StageWriter
+
+logger = logging.getLogger("meaning_engine")
+
+def _writer(target: Optional[StageStore], stage: str, params: Optional[Dict[str, Any]] = None):
+    # One writer per call: every replay is a new run, read back as the latest one
+    return StageWriter(target, stage, params=params) if target else contextlib.nullcontext()
+
+def reclean(
+    store: StageStore,
+    cleaner,
+    target: Optional[StageStore] = None,
+    source: Optional[str] = None
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """
+    Re-run cleaning over persisted "extracted" pages (no OCR).
+    Yields batches of cleaned pages; also appends them to `target` as a new run if given.
+    """
+    with _writer(target, "cleaned") as writer:
+        for batch in store.scan("extracted", source=source):
+            cleaned = [cleaner.process_chunk(page) for page in batch]
+            if writer:
+                writer.add(cleaned)
+            yield cleaned
+
+def rechunk(
+    store: StageStore,
+    chunker,
+    target: Optional[StageStore] = None,
+    source: Optional[str] = None
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """
+    Re-chunk persisted "cleaned" pages, e.g. after changing CHUNK_MICRO or the overlap.
+    """
+    with _writer(target, "chunks", params=chunker.params()) as writer:
+        for batch in store.scan("cleaned", source=source):
+            chunks = [c for page in batch for c in chunker.chunk(page)]
+            if writer:
+                writer.add(chunks)
+            yield chunks
+
+def reembed(
+    store: StageStore,
+    embedder,
+    target: Optional[StageStore] = None,
+    source: Optional[str] = None,
+    sparse_encoder: Optional[SparseEncoder] = None
+) -> Generator[Tuple[List[Dict[str, Any]], List[List[float]], List[Dict[str, Any]]], None, None]:
+    """
+    Re-embed persisted "chunks" (latest run) with the current EMBEDDING_MODEL.
+    A pure streaming scan over stored text: yields (chunks, vectors, sparse_vectors)
+    per batch, ready for VectorStore.upsert(chunks, vectors, sparse_vectors=...).
+    Sparse vectors are re-encoded too: an upsert replaces the whole point, so a
+    dense-only upsert would drop the chunk from BM25 search.
+    """
+    sparse_encoder = sparse_encoder or SparseEncoder()
+    total = 0
+    with _writer(target, "embeddings") as writer:
+        for chunks in store.scan("chunks", source=source):
+            vectors = embedder.embed([c["content"] for c in chunks])
+            if not vectors:
+                logger.error(f"Embedding failed for a batch of {len(chunks)} stored chunks. Skipping.")
+                continue
+            if writer:
+                writer.add(chunks, vectors=vectors)
+            total += len(chunks)
+            yield chunks, vectors, sparse_encoder.encode([c["content"] for c in chunks])
+    logger.info(f"Re-embedded {total} stored chunks")
@@ -0,0 +1,244 @@
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Generator, Dict, Any, List, Optional
+from urllib.parse import quote, unquote
+import logging
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from core.config import settings
+
+logger = logging.getLogger("meaning_engine")
+
+# Per-stage columns. "source" and "run_id" are not stored in the files: they are hive partition keys.
+# Metadata dicts differ per extractor, so they are kept as a JSON string column.
+# "params" (JSON) records the settings that produced the row, e.g. chunk sizes or the embedding model.
+_PAGE_FIELDS = [
+    pa.field("page", pa.int64()),
+    pa.field("timestamp", pa.float64()),
+    pa.field("total_pages", pa.int64()),
+    pa.field("content", pa.string()),
+    pa.field("metadata", pa.string()),
+    pa.field("params", pa.string()),
+]
+_CHUNK_FIELDS = [
+    pa.field("chunk_id", pa.string()),
+    pa.field("level", pa.string()),
+    pa.field("content", pa.string()),
+    pa.field("metadata", pa.string()),
+    pa.field("params", pa.string()),
+]
+
+STAGE_SCHEMAS = {
+    "extracted": pa.schema(_PAGE_FIELDS),
+    "cleaned": pa.schema(_PAGE_FIELDS + [pa.field("content_original", pa.string())]),
+    "chunks": pa.schema(_CHUNK_FIELDS),
+    "embeddings": pa.schema(_CHUNK_FIELDS + [
+        pa.field("model", pa.string()),
+        pa.field("vector", pa.list_(pa.float32())),
+    ]),
+}
+
+def new_run_id() -> str:
+    # Zero-padded ns timestamp first, so run ids sort chronologically as strings
+    return f"{time.time_ns():020d}-{uuid.uuid4().hex[:6]}"
+
+class StageStore:
+    """
+    Append-only Parquet datasets for each pipeline stage, partitioned by source and run:
+
+        <root>/<stage>/source=<name>/run_id=<run>/part-<ts>-<id>.parquet
+
+    Every write adds a new part file, so stages never rewrite earlier output.
+    Scans return the latest run per source by default, so re-chunking or
+    re-embedding never mixes old and new outputs. Reads memory-map the files
+    and stream record batches, which lets a run start from any stage
+    (e.g. re-embed stored chunks) without re-extracting.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or settings.STAGE_STORE_DIR or settings.RESULTS_DIR / "stages")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._fs = fs.LocalFileSystem(use_mmap=True)
+        # Explicit string types: otherwise a source named "2024" is inferred as an int
+        self._partitioning = ds.partitioning(
+            pa.schema([("source", pa.string()), ("run_id", pa.string())]),
+            flavor="hive"
+        )
+
+    def write(
+        self,
+        stage: str,
+        records: List[Dict[str, Any]],
+        vectors: Optional[List[List[float]]] = None,
+        run_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Append records (extractor/cleaner/chunker dicts) to a stage.
+        For the "embeddings" stage, pass the chunks as records plus their vectors.
+
+        Each call is its own run unless run_id is given (see StageWriter for
+        streaming one run over many calls). Returns the run id.
+        """
+        schema = self._schema(stage)
+        run_id = run_id or new_run_id()
+        if not records:
+            return run_id
+        if params is None and stage == "embeddings":
+            params = {"embedding_model": settings.EMBEDDING_MODEL}
+        params_json = json.dumps(params or {}, sort_keys=True, default=str)
+
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for i, record in enumerate(records):
+            row = self._to_row(stage, record)
+            row["params"] = params_json
+            if vectors is not None:
+                row["vector"] = vectors[i]
+                row["model"] = settings.EMBEDDING_MODEL
+            source = record.get("metadata", {}).get("source") or "unknown"
+            by_source.setdefault(source, []).append(row)
+
+        for source, rows in by_source.items():
+            part_dir = self._source_dir(stage, source) / f"run_id={run_id}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            part_path = part_dir / f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+            pq.write_table(pa.Table.from_pylist(rows, schema=schema), part_path)
+
+        logger.debug(f"Persisted {len(records)} records to stage '{stage}' (run {run_id})")
+        return run_id
+
+    def scan(
+        self,
+        stage: str,
+        source: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        run_id: Optional[str] = None
+    ) -> Generator[List[Dict[str, Any]], None, None]:
+        """
+        Stream a stage back as batches of pipeline dicts (same shape as written).
+        Reads the latest run of each source, or the given run_id.
+        """
+        self._schema(stage)
+        files = []
+        for src in ([source] if source else self.sources(stage)):
+            runs = self.runs(stage, src)
+            selected = run_id if run_id else (runs[-1] if runs else None)
+            if selected not in runs:
+                continue
+            run_dir = self._source_dir(stage, src) / f"run_id={selected}"
+            files.extend(str(f) for f in sorted(run_dir.glob("*.parquet")))
+        if not files:
+            return
+
+        dataset = ds.dataset(
+            files,
+            format="parquet",
+            partitioning=self._partitioning,
+            partition_base_dir=str(self.root / stage),
+            filesystem=self._fs
+        )
+        for batch in dataset.to_batches(batch_size=batch_size or settings.STAGE_SCAN_BATCH_SIZE):
+            yield [self._from_row(row) for row in batch.to_pylist()]
+
+    def sources(self, stage: str) -> List[str]:
+        """
+        Sources that have data persisted for a stage.
+        """
+        return [unquote(name) for name in self._partition_values(self.root / stage, "source")]
+
+    def runs(self, stage: str, source: str) -> List[str]:
+        """
+        Run ids persisted for a source, oldest first.
+        """
+        return self._partition_values(self._source_dir(stage, source), "run_id")
+
+    def _source_dir(self, stage: str, source: str) -> Path:
+        return self.root / stage / f"source={quote(str(source), safe='')}"
+
+    @staticmethod
+    def _partition_values(directory: Path, key: str) -> List[str]:
+        if not directory.exists():
+            return []
+        return sorted(
+            d.name.split("=", 1)[1]
+            for d in directory.iterdir()
+            if d.is_dir() and d.name.startswith(f"{key}=")
+        )
+
+    @staticmethod
+    def _schema(stage: str) -> pa.Schema:
+        if stage not in STAGE_SCHEMAS:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of {list(STAGE_SCHEMAS)}")
+        return STAGE_SCHEMAS[stage]
+
+    @staticmethod
+    def _to_row(stage: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        row = {
+            "content": record.get("content"),
+            "metadata": json.dumps(record.get("metadata", {}), default=str),
+        }
+        if stage in ("extracted", "cleaned"):
+            row["page"] = record.get("page")
+            row["timestamp"] = record.get("timestamp")
+            row["total_pages"] = record.get("total_pages")
+            if stage == "cleaned":
+                row["content_original"] = record.get("content_original")
+        else:
+            row["chunk_id"] = record.get("chunk_id")
+            row["level"] = record.get("level")
+        return row
+
+    @staticmethod
+    def _from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        row.pop("source", None)
+        row["metadata"] = json.loads(row["metadata"]) if row.get("metadata") else {}
+        row["params"] = json.loads(row["params"]) if row.get("params") else {}
+        return row
+
+class StageWriter:
+    """
+    Streams one run of a stage: buffers records and appends a part file every
+    STAGE_WRITE_BATCH_SIZE records, so long documents are persisted as they
+    are processed and a failure keeps everything written so far.
+    """
+
+    def __init__(self, store: StageStore, stage: str, params: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self.stage = stage
+        self.params = params
+        self.run_id = new_run_id()
+        self.total = 0  # Records received, flushed or not
+        self._records: List[Dict[str, Any]] = []
+        self._vectors: List[List[float]] = []
+
+    def add(self, records: List[Dict[str, Any]], vectors: Optional[List[List[float]]] = None):
+        self._records.extend(records)
+        self.total += len(records)
+        if vectors is not None:
+            self._vectors.extend(vectors)
+        if len(self._records) >= settings.STAGE_WRITE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._records:
+            return
+        self.store.write(
+            self.stage,
+            self._records,
+            vectors=self._vectors or None,
+            run_id=self.run_id,
+            params=self.params
+        )
+        self._records, self._vectors = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from benchmarks.corpus import SyntheticCorpus
+from benchmarks.harness import measure, percentile
+
+
+def test_same_seed_gives_same_text(tmp_path):
+    first = SyntheticCorpus(tmp_path / "a", seed=7)
+    second = SyntheticCorpus(tmp_path / "b", seed=7)
+
+    assert first.page_text() == second.page_text()
+    assert first.no_break_pages() == second.no_break_pages()
+    assert SyntheticCorpus(tmp_path, seed=8).page_text() != SyntheticCorpus(tmp_path, seed=7).page_text()
+
+
+def test_no_break_pages_have_no_breaks(tmp_path):
+    pages = SyntheticCorpus(tmp_path).no_break_pages()
+    assert pages
+    assert not any("\n" in page or "." in page for page in pages)
+
+
+def test_unknown_scale_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SyntheticCorpus(tmp_path, scale="huge")
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+def test_measure_counts_units_and_items():
+    result = measure(["a", "bb", "ccc"], len, "chars")
+
+    assert result["status"] == "ok"
+    assert result["items"] == 3
+    assert result["units"] == 6
+    assert result["latency_ms"]["p50"] is not None
+
+
+def test_measure_without_items_is_valid_json():
+    result = measure([], len, "chars")
+
+    assert result["items"] == 0
+    assert result["latency_ms"] == {"p50": None, "p99": None, "mean": None, "max": None}
+    json.dumps(result, allow_nan=False)
@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from core.config import settings
+from core.observability import instrumentation
+from core.observability.instrumentation import traced, span, error, registry
+
+
+@pytest.fixture
+def metrics_on(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def test_disabled_returns_function_unwrapped(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+    def fn():
+        return 1
+
+    assert traced("noop")(fn) is fn
+    assert span("noop") is span("other")  # Shared no-op context
+
+
+def test_function_span_records_calls_and_items(metrics_on):
+    @traced("unit.chunk", items=len)
+    def chunk(n):
+        return list(range(n))
+
+    chunk(3)
+    chunk(2)
+    snap = metrics_on.snapshot()["unit.chunk"]
+    assert snap["calls"] == 2
+    assert snap["items"] == 5
+    assert snap["errors"] == 0
+
+
+def test_function_span_counts_escaping_exceptions(metrics_on):
+    @traced("unit.fail")
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+    assert metrics_on.snapshot()["unit.fail"]["errors"] == 1
+
+
+def test_generator_span_excludes_consumer_time(metrics_on):
+    @traced("unit.stream")
+    def stream():
+        for i in range(3):
+            yield i
+
+    for _ in stream():
+        time.sleep(0.02)  # Consumer work must not be billed to the generator
+
+    snap = metrics_on.snapshot()["unit.stream"]
+    assert snap["calls"] == 1
+    assert snap["items"] == 3
+    assert snap["total_s"] < 0.02
+
+
+def test_generator_span_recorded_when_closed_early(metrics_on):
+    @traced("unit.partial")
+    def stream():
+        yield from range(10)
+
+    gen = stream()
+    next(gen)
+    gen.close()
+    snap = metrics_on.snapshot()["unit.partial"]
+    assert snap["calls"] == 1
+    assert snap["items"] == 1
+
+
+def test_generator_span_counts_errors(metrics_on):
+    @traced("unit.broken")
+    def stream():
+        yield 1
+        raise RuntimeError("bad page")
+
+    with pytest.raises(RuntimeError):
+        list(stream())
+    assert metrics_on.snapshot()["unit.broken"]["errors"] == 1
+
+
+def test_block_span_and_handled_errors(metrics_on):
+    with span("unit.render"):
+        pass
+    error("unit.render")
+
+    snap = metrics_on.snapshot()["unit.render"]
+    assert snap["calls"] == 1
+    assert snap["errors"] == 1
+
+
+def test_prometheus_rendering(metrics_on):
+    with span('unit."quoted"'):
+        pass
+    text = metrics_on.render_prometheus()
+    assert 'meaning_engine_span_duration_seconds_count{span="unit.\\"quoted\\""} 1' in text
+    assert '# TYPE meaning_engine_span_duration_seconds histogram' in text
+
+
+def test_profile_document_hands_samples_to_hook(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_SLOW_DOCS_MS", 0)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_INTERVAL_MS", 1)
+    captured = {}
+    monkeypatch.setattr(instrumentation, "_slow_document_hook", lambda src, secs, samples: captured.update(
+        source=src, samples=samples
+    ))
+
+    with instrumentation.profile_document("slow.pdf"):
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    assert captured["source"] == "slow.pdf"
+    assert any("test_profile_document_hands_samples_to_hook" in stack for stack in captured["samples"])
+
+
+def test_since_reports_only_new_activity(metrics_on):
+    with span("unit.before"):
+        pass
+    before = metrics_on.snapshot()
+
+    with span("unit.before"):
+        pass
+    with span("unit.after"):
+        pass
+    error("unit.after")
+
+    delta = metrics_on.since(before)
+    assert delta["unit.before"]["calls"] == 1
+    assert delta["unit.after"]["errors"] == 1
+    assert metrics_on.since(metrics_on.snapshot()) == {}
+
+
+def test_metrics_server_runs_in_otel_mode(metrics_on, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_EXPORTER", "otel")
+    monkeypatch.setattr(settings, "METRICS_PORT", 0)  # Any free port
+    monkeypatch.setattr(instrumentation, "_server", None)
+
+    server = instrumentation.start_metrics_server()
+    try:
+        assert server is not None
+    finally:
+        server.shutdown()
+        server.server_close()
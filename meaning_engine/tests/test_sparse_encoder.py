@@ -0,0 +1,44 @@
+from core.embeddings.sparse_encoder import SparseEncoder
+
+
+def test_tokenize_keeps_identifiers_whole_and_adds_parts():
+    tokens = SparseEncoder.tokenize("See clause 4.2.1 and part AB-1234.")
+    assert tokens == ["see", "clause", "4.2.1", "4", "2", "1", "and", "part", "ab-1234", "ab", "1234"]
+
+
+def test_tokenize_without_splitting_compounds():
+    assert SparseEncoder.tokenize("Clause 4.2.1", split_compounds=False) == ["clause", "4.2.1"]
+
+
+def test_encode_is_deterministic_and_aligned():
+    encoder = SparseEncoder()
+    first, second = encoder.encode(["pump AB-1234 pump", "valve"]), encoder.encode(["pump AB-1234 pump", "valve"])
+    assert first == second
+    for vector in first:
+        assert len(vector["indices"]) == len(vector["values"])
+        assert all(v > 0 for v in vector["values"])
+
+
+def test_encode_saturates_term_frequency():
+    encoder = SparseEncoder()
+    pump = SparseEncoder._term_id("pump")
+    once = encoder.encode(["pump"])[0]
+    many = encoder.encode(["pump " * 50])[0]
+    weight_once = once["values"][once["indices"].index(pump)]
+    weight_many = many["values"][many["indices"].index(pump)]
+    assert weight_once < weight_many < encoder.k1 + 1
+
+
+def test_encode_query_matches_only_whole_identifier():
+    encoder = SparseEncoder()
+    query = encoder.encode_query("4.2.1")
+    assert query == {"indices": [SparseEncoder._term_id("4.2.1")], "values": [1.0]}
+    # The document side still carries the whole token, so the exact clause matches
+    document = encoder.encode(["Liability is limited under 4.2.1"])[0]
+    assert query["indices"][0] in document["indices"]
+
+
+def test_encode_handles_empty_text():
+    encoder = SparseEncoder()
+    assert encoder.encode([""]) == [{"indices": [], "values": []}]
+    assert encoder.encode_query("") == {"indices": [], "values": []}
@@ -0,0 +1,128 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from core.processing.chunker import HierarchicalChunker
+from core.storage.replay import rechunk, reembed
+from core.storage.stage_store import StageStore, StageWriter
+
+
+def _page(source, page, content):
+    return {"content": content, "page": page, "metadata": {"source": source, "is_ocr": False}}
+
+
+def _scan_all(store, stage, **kwargs):
+    return [record for batch in store.scan(stage, **kwargs) for record in batch]
+
+
+def test_write_scan_round_trip(tmp_path):
+    store = StageStore(tmp_path)
+    store.write("extracted", [_page("a b/1.pdf", 1, "first"), _page("2024", 2, "second")])
+
+    records = _scan_all(store, "extracted")
+    assert sorted(r["content"] for r in records) == ["first", "second"]
+    first = next(r for r in records if r["content"] == "first")
+    assert first["page"] == 1
+    assert first["metadata"] == {"source": "a b/1.pdf", "is_ocr": False}
+
+
+def test_scan_filters_by_source_named_like_a_number(tmp_path):
+    store = StageStore(tmp_path)
+    store.write("extracted", [_page("2024", 1, "numeric"), _page("other.pdf", 1, "other")])
+
+    assert store.sources("extracted") == ["2024", "other.pdf"]
+    assert [r["content"] for r in _scan_all(store, "extracted", source="2024")] == ["numeric"]
+
+
+def test_scan_returns_latest_run_only(tmp_path):
+    store = StageStore(tmp_path)
+    first_run = store.write("chunks", [{"chunk_id": "c0", "level": "micro", "content": "old", "metadata": {"source": "s"}}])
+    store.write("chunks", [{"chunk_id": "c0", "level": "micro", "content": "new", "metadata": {"source": "s"}}])
+
+    assert [r["content"] for r in _scan_all(store, "chunks")] == ["new"]
+    assert [r["content"] for r in _scan_all(store, "chunks", run_id=first_run)] == ["old"]
+    assert len(store.runs("chunks", "s")) == 2
+
+
+def test_rechunk_twice_does_not_duplicate(tmp_path):
+    store = StageStore(tmp_path)
+    store.write("cleaned", [_page("doc.pdf", 1, "Alpha beta."), _page("doc.pdf", 2, "Gamma delta.")])
+    chunker = HierarchicalChunker()
+
+    first = [c for batch in rechunk(store, chunker, target=store) for c in batch]
+    second = [c for batch in rechunk(store, chunker, target=store) for c in batch]
+
+    stored = _scan_all(store, "chunks")
+    assert len(first) == len(second) == len(stored)
+    assert stored[0]["params"] == chunker.params()
+
+
+def test_writer_streams_one_run(tmp_path, monkeypatch):
+    from core.config import settings
+    monkeypatch.setattr(settings, "STAGE_WRITE_BATCH_SIZE", 2)
+    store = StageStore(tmp_path)
+
+    with StageWriter(store, "extracted") as writer:
+        for i in range(5):
+            writer.add([_page("big.pdf", i + 1, f"page {i + 1}")])
+        # Two full batches are already on disk before the document finishes
+        assert len(_scan_all(store, "extracted")) == 4
+
+    assert store.runs("extracted", "big.pdf") == [writer.run_id]
+    assert sorted(r["page"] for r in _scan_all(store, "extracted")) == [1, 2, 3, 4, 5]
+
+
+def test_embeddings_store_vectors_and_model(tmp_path):
+    store = StageStore(tmp_path)
+    chunk = {"chunk_id": "c0", "level": "micro", "content": "text", "metadata": {"source": "s"}}
+    store.write("embeddings", [chunk], vectors=[[0.5, 0.25]])
+
+    (record,) = _scan_all(store, "embeddings")
+    assert record["vector"] == [0.5, 0.25]
+    assert record["params"]["embedding_model"] == record["model"]
+
+
+def _axis_vector(x, y):
+    return [x, y] + [0.0] * 382  # VectorStore collections are 384-dim
+
+
+class _LookupEmbedder:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed(self, texts):
+        return [self.vectors[t] for t in texts]
+
+
+def test_reembed_keeps_chunks_findable_by_identifier(tmp_path, monkeypatch):
+    pytest.importorskip("qdrant_client")
+    from core.config import settings
+    from core.embeddings.sparse_encoder import SparseEncoder
+    from core.embeddings.vector_store import VectorStore
+    monkeypatch.setattr(settings, "QDRANT_LOCATION", ":memory:")
+
+    store = StageStore(tmp_path)
+    texts = {
+        "Pump housing overview.": _axis_vector(1.0, 0.0),
+        "Seal kit maintenance notes.": _axis_vector(0.7, 0.7),
+        "Replace part AB-1234 yearly.": _axis_vector(0.0, 1.0),
+    }
+    store.write("chunks", [
+        {"chunk_id": f"c{i}", "level": "micro", "content": text, "metadata": {"source": "manual.pdf"}}
+        for i, text in enumerate(texts)
+    ])
+
+    vector_store = VectorStore()
+    for chunks, vectors, sparse_vectors in reembed(store, _LookupEmbedder(texts)):
+        vector_store.upsert(chunks, vectors, sparse_vectors=sparse_vectors)
+
+    # Dense alone ranks the identifier chunk last: only its bm25 vector can lift it to the top
+    results = vector_store.hybrid_search(
+        _axis_vector(1.0, 0.1), SparseEncoder().encode_query("AB-1234"), limit=1
+    )
+    assert [r["content"] for r in results] == ["Replace part AB-1234 yearly."]
+
+
+def test_unknown_stage_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        StageStore(tmp_path).write("bogus", [{}])